@@ -3,21 +3,32 @@ Example: Populating AMG with Software Project Data
 
 This example demonstrates how to use the Software Project Schema
 to track a project like AgentForge in the AMG knowledge graph.
+
+Entities are written with Cypher as labelled nodes with a JSON `metadata`
+property; see "Storing the Schema Directly in Neo4j" in SOFTWARE_PROJECT_SCHEMA.md
+for how this maps onto the schema's entity and relationship types.
 """
 
 import asyncio
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Sequence
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 
 # Assuming graphiti_core is installed
 # from graphiti_core import Graphiti
+# from graphiti_core.driver.neo4j_driver import Neo4jDriver
 
 
 # =============================================================================
-# Entity Definitions (Pydantic Models for Validation)
+# Entity Definitions (Pydantic Dataclasses for Validation)
 # =============================================================================
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, TypeAdapter
+from pydantic.dataclasses import dataclass
 from enum import Enum
 
 
@@ -35,6 +46,15 @@ class FeatureStatus(str, Enum):
     DEPRECATED = "deprecated"
 
 
+# Display marker per feature status, built once rather than on every lookup
+FEATURE_STATUS_EMOJI: dict[str, str] = {
+    FeatureStatus.COMPLETED.value: "✅",
+    FeatureStatus.IN_PROGRESS.value: "🚧",
+    FeatureStatus.PLANNED.value: "📋",
+    FeatureStatus.DEPRECATED.value: "⚠️"
+}
+
+
 class Priority(str, Enum):
     CRITICAL = "critical"
     HIGH = "high"
@@ -50,37 +70,56 @@ class ComponentType(str, Enum):
     PLUGIN = "plugin"
 
 
-class SoftwareProject(BaseModel):
+# Enum-backed fields hold the raw string value, validated against the enum, so
+# serialized rows carry plain strings and the declared type matches at runtime
+ProjectStatusValue = Annotated[str, AfterValidator(lambda v: ProjectStatus(v).value)]
+FeatureStatusValue = Annotated[str, AfterValidator(lambda v: FeatureStatus(v).value)]
+PriorityValue = Annotated[str, AfterValidator(lambda v: Priority(v).value)]
+ComponentTypeValue = Annotated[str, AfterValidator(lambda v: ComponentType(v).value)]
+
+
+# Entities are validated like Pydantic models, but are frozen and use __slots__:
+# the example data is static, and slotted instances skip the per-instance __dict__.
+@dataclass(frozen=True, slots=True)
+class SoftwareProject:
     """Root entity for a software project."""
     name: str
     repo_url: Optional[str] = None
     language: Optional[str] = None
     framework: Optional[str] = None
     version: Optional[str] = None
-    status: ProjectStatus = ProjectStatus.ACTIVE
+    status: ProjectStatusValue = ProjectStatus.ACTIVE.value
     description: Optional[str] = None
     license: Optional[str] = None
 
 
-class Feature(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Feature:
     """A major capability or functional area."""
     name: str
-    status: FeatureStatus = FeatureStatus.PLANNED
-    priority: Optional[Priority] = None
+    status: FeatureStatusValue = FeatureStatus.PLANNED.value
+    priority: Optional[PriorityValue] = None
     release_version: Optional[str] = None
     description: Optional[str] = None
 
 
-class Component(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Component:
     """An architectural component, service, or module."""
     name: str
-    type: Optional[ComponentType] = None
+    type: Optional[ComponentTypeValue] = None
     path: Optional[str] = None
     language: Optional[str] = None
-    dependencies: list[str] = Field(default_factory=list)
+    dependencies: tuple[str, ...] = ()
     description: Optional[str] = None
 
 
+# Serialize whole lists in a single pydantic-core call instead of one dump per item
+_PROJECT_ADAPTER = TypeAdapter(SoftwareProject)
+_FEATURES_ADAPTER = TypeAdapter(list[Feature])
+_COMPONENTS_ADAPTER = TypeAdapter(list[Component])
+
+
 # =============================================================================
 # Example Data for AgentForge
 # =============================================================================
@@ -131,7 +170,7 @@ AGENTFORGE_COMPONENTS = [
         type=ComponentType.MODULE,
         path="src/app/",
         language="TypeScript",
-        dependencies=["React", "Next.js", "TailwindCSS"],
+        dependencies=("React", "Next.js", "TailwindCSS"),
         description="Next.js frontend application"
     ),
     Component(
@@ -139,7 +178,7 @@ AGENTFORGE_COMPONENTS = [
         type=ComponentType.SERVICE,
         path="src/app/api/",
         language="TypeScript",
-        dependencies=["Next.js", "Prisma"],
+        dependencies=("Next.js", "Prisma"),
         description="Backend API endpoints"
     ),
     Component(
@@ -147,7 +186,7 @@ AGENTFORGE_COMPONENTS = [
         type=ComponentType.MODULE,
         path="src/engine/",
         language="TypeScript",
-        dependencies=["LangChain", "OpenAI"],
+        dependencies=("LangChain", "OpenAI"),
         description="Core execution engine for agent workflows"
     ),
     Component(
@@ -155,149 +194,338 @@ AGENTFORGE_COMPONENTS = [
         type=ComponentType.LIBRARY,
         path="src/lib/mcp/",
         language="TypeScript",
-        dependencies=["@modelcontextprotocol/sdk"],
+        dependencies=("@modelcontextprotocol/sdk",),
         description="Model Context Protocol integration layer"
     ),
 ]
 
+AGENTFORGE_COMPONENT_NAMES = frozenset(c.name for c in AGENTFORGE_COMPONENTS)
+
 
 # =============================================================================
 # Functions to Populate AMG
 # =============================================================================
 
+# Rows per UNWIND query; keeps each transaction's memory footprint bounded
+BATCH_SIZE = 1000
+
+# Upper bound on in-flight queries across the whole module so we never exhaust
+# the driver's connection pool; keep it at or below the pool size (see main())
+MAX_CONCURRENCY = int(os.getenv("AMG_MAX_CONCURRENCY", "16"))
+if MAX_CONCURRENCY < 1:
+    raise ValueError(f"AMG_MAX_CONCURRENCY must be at least 1, got {MAX_CONCURRENCY}")
+
+_query_semaphore: asyncio.Semaphore | None = None
+_query_semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_query_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore shared by every query, created lazily per event loop."""
+    global _query_semaphore, _query_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _query_semaphore is None or _query_semaphore_loop is not loop:
+        _query_semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        _query_semaphore_loop = loop
+    return _query_semaphore
+
+
+async def _execute_query(graphiti, query: str, **params):
+    """Run a query while holding a slot of the shared MAX_CONCURRENCY limit."""
+    async with _get_query_semaphore():
+        return await graphiti.driver.execute_query(query, **params)
+
+
+def _encode_metadata(properties: dict) -> str:
+    """Serialize properties to canonical JSON, stored as a single `metadata` node property."""
+    return json.dumps(properties, sort_keys=True, separators=(",", ":"))
+
+
+def _content_hash(metadata: str) -> str:
+    """Stable digest of an entity's encoded metadata, used to skip unchanged writes on re-import."""
+    return hashlib.blake2b(metadata.encode(), digest_size=16).hexdigest()
+
+
 async def populate_project(graphiti, project: SoftwareProject):
     """Add a software project to the knowledge graph."""
-    await graphiti.add_entity(
+    metadata = _encode_metadata(_PROJECT_ADAPTER.dump_python(project, exclude_none=True))
+    result = await _execute_query(
+        graphiti,
+        """
+        MERGE (p:SoftwareProject {name: $name})
+        WITH p
+        WHERE p.content_hash IS NULL OR p.content_hash <> $content_hash
+        SET p.summary = $summary, p.metadata = $metadata, p.content_hash = $content_hash
+        RETURN p.name AS name
+        """,
         name=project.name,
-        entity_type="software_project",
         summary=project.description,
-        metadata=project.model_dump(exclude_none=True)
+        metadata=metadata,
+        content_hash=_content_hash(metadata)
     )
-    print(f"✅ Added project: {project.name}")
-
+    if result.records:
+        print(f"✅ Wrote project: {project.name}")
+    else:
+        print(f"✅ Project unchanged: {project.name}")
+
+
+def _chunks(rows: list[dict], size: int = BATCH_SIZE):
+    """Split rows into batches so a single transaction never grows unbounded."""
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+async def _bulk_merge(
+    graphiti,
+    label: str,
+    rows: Sequence[dict],
+    rel_type: str,
+    project_name: str,
+    fact_template: str
+) -> list[str]:
+    """
+    MERGE entities and link them to the project; returns the names actually written.
 
-async def populate_features(graphiti, project_name: str, features: list[Feature]):
-    """Add features and link them to the project."""
-    for feature in features:
-        # Add feature entity
-        await graphiti.add_entity(
-            name=feature.name,
-            entity_type="feature",
-            summary=feature.description,
-            metadata=feature.model_dump(exclude_none=True)
+    `label` and `rel_type` are interpolated into the query, so only pass trusted constants.
+    """
+    query = f"""
+        MATCH (p:SoftwareProject {{name: $project_name}})
+        UNWIND $rows AS r
+        MERGE (n:{label} {{name: r.name}})
+        WITH p, r, n, coalesce(n.content_hash <> r.content_hash, true) AS changed
+        FOREACH (_ IN CASE WHEN changed THEN [1] ELSE [] END |
+            SET n.summary = r.summary,
+                n.metadata = r.metadata,
+                n.content_hash = r.content_hash
         )
-        
-        # Create relationship to project
-        await graphiti.add_relationship(
-            source_entity=project_name,
-            target_entity=feature.name,
-            relationship_type="has_feature",
-            fact=f"{project_name} includes the {feature.name} feature"
+        MERGE (p)-[e:{rel_type}]->(n)
+        ON CREATE SET e.fact = r.fact
+        RETURN n.name AS name, changed
+    """
+    batch_rows = []
+    # De-duplicate by name (last row wins) so no two batches MERGE the same node
+    for row in {row["name"]: row for row in rows}.values():
+        metadata = _encode_metadata(row)
+        batch_rows.append({
+            "name": row["name"],
+            "summary": row.get("description"),
+            "metadata": metadata,
+            "content_hash": _content_hash(metadata),
+            "fact": fact_template.format(project=project_name, name=row["name"])
+        })
+
+    # Names are unique across batches, so they can run concurrently: only the
+    # project relationship MERGEs queue on the shared project-node lock, while
+    # the entity MERGEs and round-trips overlap
+    results = await asyncio.gather(
+        *(
+            _execute_query(graphiti, query, rows=batch, project_name=project_name)
+            for batch in _chunks(batch_rows)
         )
-        print(f"  ✅ Added feature: {feature.name}")
-
-
-async def populate_components(graphiti, project_name: str, components: list[Component]):
+    )
+    return [
+        record["name"]
+        for result in results
+        for record in result.records
+        if record["changed"]
+    ]
+
+
+async def populate_features(
+    graphiti,
+    project_name: str,
+    features: list[Feature],
+    verbose: bool = False
+):
+    """Add features and link them to the project."""
+    written = await _bulk_merge(
+        graphiti,
+        label="Feature",
+        rows=_FEATURES_ADAPTER.dump_python(features, exclude_none=True),
+        rel_type="HAS_FEATURE",
+        project_name=project_name,
+        fact_template="{project} includes the {name} feature"
+    )
+    if verbose:
+        for name in written:
+            print(f"  ✅ Wrote feature: {name}")
+    print(f"  ✅ Wrote {len(written)} features")
+
+
+async def populate_components(
+    graphiti,
+    project_name: str,
+    components: list[Component],
+    verbose: bool = False
+):
     """Add components and link them to the project."""
-    for component in components:
-        # Add component entity
-        await graphiti.add_entity(
-            name=component.name,
-            entity_type="component",
-            summary=component.description,
-            metadata=component.model_dump(exclude_none=True)
+    written = await _bulk_merge(
+        graphiti,
+        label="Component",
+        rows=_COMPONENTS_ADAPTER.dump_python(components, exclude_none=True),
+        rel_type="HAS_COMPONENT",
+        project_name=project_name,
+        fact_template="{project} contains the {name} component"
+    )
+    if verbose:
+        for name in written:
+            print(f"  ✅ Wrote component: {name}")
+    print(f"  ✅ Wrote {len(written)} components")
+
+
+async def add_component_dependencies(
+    graphiti,
+    components: list[Component],
+    names: frozenset[str] | None = None,
+    verbose: bool = False
+):
+    """Create dependency relationships between components named in `names`."""
+    component_names = names if names is not None else frozenset(c.name for c in components)
+
+    # Only create internal dependency relationships; dict.fromkeys drops
+    # repeated (source, target) pairs while keeping their original order
+    pairs = list(dict.fromkeys(
+        (component.name, dep)
+        for component in components
+        for dep in component.dependencies
+        if dep in component_names
+    ))
+    edges = [
+        {"source": source, "target": target, "fact": f"{source} depends on {target}"}
+        for source, target in pairs
+    ]
+
+    # Pairs are unique and no batch touches the project node, so batches can
+    # run concurrently within the shared query limit
+    results = await asyncio.gather(
+        *(
+            _execute_query(
+                graphiti,
+                """
+                UNWIND $edges AS e
+                MATCH (a:Component {name: e.source})
+                MATCH (b:Component {name: e.target})
+                WITH a, b, e, NOT EXISTS { (a)-[:DEPENDS_ON]->(b) } AS created
+                MERGE (a)-[r:DEPENDS_ON]->(b)
+                ON CREATE SET r.fact = e.fact
+                RETURN a.name AS source, b.name AS target, created
+                """,
+                edges=batch
+            )
+            for batch in _chunks(edges)
         )
-        
-        # Create relationship to project
-        await graphiti.add_relationship(
-            source_entity=project_name,
-            target_entity=component.name,
-            relationship_type="has_component",
-            fact=f"{project_name} contains the {component.name} component"
+    )
+    written = [
+        (record["source"], record["target"])
+        for result in results
+        for record in result.records
+        if record["created"]
+    ]
+    if verbose:
+        for source, target in written:
+            print(f"  🔗 {source} → depends_on → {target}")
+    print(f"  🔗 Added {len(written)} component dependencies")
+
+
+async def populate_agentforge(graphiti, verbose: bool = False):
+    """Populate the graph with the full AgentForge example."""
+    await populate_project(graphiti, AGENTFORGE_PROJECT)
+    # Features and components only need the project; dependencies need the components
+    await asyncio.gather(
+        populate_features(
+            graphiti,
+            AGENTFORGE_PROJECT.name,
+            AGENTFORGE_FEATURES,
+            verbose=verbose
+        ),
+        populate_components(
+            graphiti,
+            AGENTFORGE_PROJECT.name,
+            AGENTFORGE_COMPONENTS,
+            verbose=verbose
         )
-        print(f"  ✅ Added component: {component.name}")
-
-
-async def add_component_dependencies(graphiti, components: list[Component]):
-    """Create dependency relationships between components."""
-    component_names = {c.name for c in components}
-    
-    for component in components:
-        for dep in component.dependencies:
-            # Only create internal dependency relationships
-            if dep in component_names:
-                await graphiti.add_relationship(
-                    source_entity=component.name,
-                    target_entity=dep,
-                    relationship_type="depends_on",
-                    fact=f"{component.name} depends on {dep}"
-                )
-                print(f"  🔗 {component.name} → depends_on → {dep}")
+    )
+    await add_component_dependencies(
+        graphiti, AGENTFORGE_COMPONENTS, AGENTFORGE_COMPONENT_NAMES, verbose=verbose
+    )
 
 
 # =============================================================================
 # Main Execution
 # =============================================================================
 
-async def main():
+async def main(max_connection_pool_size: int = 50, fetch_size: int = 1000):
     """
     Main function to populate AMG with AgentForge data.
-    
+
     Note: This is a demonstration. In production, you would:
     1. Initialize Graphiti with your Neo4j credentials
     2. Call the setup methods
     3. Handle errors appropriately
+
+    `max_connection_pool_size` and `fetch_size` configure the Neo4j driver for
+    bulk writes. Keep AMG_MAX_CONCURRENCY at or below the pool size, otherwise
+    concurrent queries just queue waiting for a free connection.
     """
-    
-    print("="*60)
-    print("Software Project Schema - AgentForge Example")
-    print("="*60)
-    print()
-    
+
+    # Assemble the report and write it in one go rather than one print() per line
+    rule = "=" * 60
+    lines = [
+        rule,
+        "Software Project Schema - AgentForge Example",
+        rule,
+        "",
+    ]
+
     # In production, uncomment and configure:
-    # graphiti = Graphiti(
-    #     neo4j_uri="bolt://localhost:7687",
-    #     neo4j_user="neo4j",
-    #     neo4j_password="password"
+    # driver = Neo4jDriver(
+    #     uri="bolt://localhost:7687",
+    #     user="neo4j",
+    #     password="password",
+    #     max_connection_pool_size=max_connection_pool_size,
+    #     connection_acquisition_timeout=60,
+    #     fetch_size=fetch_size
     # )
+    # graphiti = Graphiti(graph_driver=driver)
     # await graphiti.build_indices_and_constraints()
-    
-    print("📦 Project Definition:")
-    print(f"   Name: {AGENTFORGE_PROJECT.name}")
-    print(f"   Language: {AGENTFORGE_PROJECT.language}")
-    print(f"   Framework: {AGENTFORGE_PROJECT.framework}")
-    print(f"   Version: {AGENTFORGE_PROJECT.version}")
-    print()
-    
-    print("🎯 Features:")
+
+    lines += [
+        "📦 Project Definition:",
+        f"   Name: {AGENTFORGE_PROJECT.name}",
+        f"   Language: {AGENTFORGE_PROJECT.language}",
+        f"   Framework: {AGENTFORGE_PROJECT.framework}",
+        f"   Version: {AGENTFORGE_PROJECT.version}",
+        "",
+        "🎯 Features:",
+    ]
     for f in AGENTFORGE_FEATURES:
-        status_emoji = {
-            FeatureStatus.COMPLETED: "✅",
-            FeatureStatus.IN_PROGRESS: "🚧",
-            FeatureStatus.PLANNED: "📋",
-            FeatureStatus.DEPRECATED: "⚠️"
-        }.get(f.status, "❓")
-        print(f"   {status_emoji} {f.name} ({f.status.value})")
-    print()
-    
-    print("🧩 Components:")
+        status_emoji = FEATURE_STATUS_EMOJI.get(f.status, "❓")
+        lines.append(f"   {status_emoji} {f.name} ({f.status})")
+    lines += ["", "🧩 Components:"]
+
     for c in AGENTFORGE_COMPONENTS:
-        print(f"   📁 {c.name} ({c.type.value if c.type else 'unknown'})")
-        print(f"      Path: {c.path}")
-        print(f"      Dependencies: {', '.join(c.dependencies)}")
-    print()
-    
-    print("="*60)
-    print("To populate AMG, uncomment the Graphiti initialization")
-    print("and run the populate_* functions with your instance.")
-    print("="*60)
-    
+        lines += [
+            f"   📁 {c.name} ({c.type or 'unknown'})",
+            f"      Path: {c.path}",
+            f"      Dependencies: {', '.join(c.dependencies)}",
+        ]
+    lines += [
+        "",
+        rule,
+        "To populate AMG, uncomment the Graphiti initialization",
+        "and run the populate_* functions with your instance.",
+        rule,
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+
     # Example population sequence:
-    # await populate_project(graphiti, AGENTFORGE_PROJECT)
-    # await populate_features(graphiti, AGENTFORGE_PROJECT.name, AGENTFORGE_FEATURES)
-    # await populate_components(graphiti, AGENTFORGE_PROJECT.name, AGENTFORGE_COMPONENTS)
-    # await add_component_dependencies(graphiti, AGENTFORGE_COMPONENTS)
+    # await populate_agentforge(graphiti)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional; it lowers per-await overhead once the writes run concurrently
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
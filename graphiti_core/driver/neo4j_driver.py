@@ -39,11 +39,25 @@ class Neo4jDriver(GraphDriver):
         user: str | None,
         password: str | None,
         database: str = 'neo4j',
+        max_connection_pool_size: int | None = None,
+        connection_acquisition_timeout: float | None = None,
+        fetch_size: int | None = None,
     ):
         super().__init__()
+        # Only forward the tuning options that were set so the neo4j driver defaults apply otherwise
+        driver_config: dict[str, Any] = {
+            key: value
+            for key, value in {
+                'max_connection_pool_size': max_connection_pool_size,
+                'connection_acquisition_timeout': connection_acquisition_timeout,
+                'fetch_size': fetch_size,
+            }.items()
+            if value is not None
+        }
         self.client = AsyncGraphDatabase.driver(
             uri=uri,
             auth=(user or '', password or ''),
+            **driver_config,
         )
         self._database = database
 
@@ -0,0 +1,56 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest.mock import patch
+
+from graphiti_core.driver.driver import GraphProvider
+from graphiti_core.driver.neo4j_driver import Neo4jDriver
+
+
+class TestNeo4jDriverInit:
+    """Tests for Neo4jDriver connection configuration."""
+
+    def test_init_uses_driver_defaults(self):
+        """Test that no tuning options are forwarded when none are set."""
+        with patch('graphiti_core.driver.neo4j_driver.AsyncGraphDatabase') as mock_graph_db:
+            driver = Neo4jDriver(
+                uri='bolt://test-host:7687', user='test-user', password='test-pass'
+            )
+
+            assert driver.provider == GraphProvider.NEO4J
+            mock_graph_db.driver.assert_called_once_with(
+                uri='bolt://test-host:7687', auth=('test-user', 'test-pass')
+            )
+
+    def test_init_forwards_pool_and_fetch_settings(self):
+        """Test that pool and fetch settings are passed through to the neo4j driver."""
+        with patch('graphiti_core.driver.neo4j_driver.AsyncGraphDatabase') as mock_graph_db:
+            Neo4jDriver(
+                uri='bolt://test-host:7687',
+                user='test-user',
+                password='test-pass',
+                max_connection_pool_size=50,
+                connection_acquisition_timeout=60,
+                fetch_size=1000,
+            )
+
+            mock_graph_db.driver.assert_called_once_with(
+                uri='bolt://test-host:7687',
+                auth=('test-user', 'test-pass'),
+                max_connection_pool_size=50,
+                connection_acquisition_timeout=60,
+                fetch_size=1000,
+            )
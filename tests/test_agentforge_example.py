@@ -0,0 +1,147 @@
+"""
+Copyright 2024, Zep Software, Inc.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+EXAMPLE_PATH = (
+    Path(__file__).resolve().parents[1] / 'docs' / 'schemas' / 'examples' / 'agentforge_example.py'
+)
+_spec = importlib.util.spec_from_file_location('agentforge_example', EXAMPLE_PATH)
+assert _spec is not None and _spec.loader is not None
+example = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(example)
+
+
+class FakeDriver:
+    """Records execute_query calls and answers as if every row was written."""
+
+    def __init__(self, project_exists: bool = True):
+        self.project_exists = project_exists
+        self.calls: list[tuple[str, dict]] = []
+
+    async def execute_query(self, query, **params):
+        self.calls.append((query, params))
+        if 'rows' in params:
+            if not self.project_exists:
+                return SimpleNamespace(records=[])
+            return SimpleNamespace(
+                records=[{'name': row['name'], 'changed': True} for row in params['rows']]
+            )
+        if 'edges' in params:
+            return SimpleNamespace(
+                records=[
+                    {'source': edge['source'], 'target': edge['target'], 'created': True}
+                    for edge in params['edges']
+                ]
+            )
+        return SimpleNamespace(records=[{'name': params['name']}])
+
+
+def _graphiti(driver: FakeDriver) -> SimpleNamespace:
+    return SimpleNamespace(driver=driver)
+
+
+def _component(name: str, dependencies: tuple[str, ...] = ()):
+    return example.Component(
+        name=name,
+        type=example.ComponentType.SERVICE,
+        description=f'{name} description',
+        dependencies=dependencies,
+    )
+
+
+async def test_bulk_merge_chunks_rows_at_batch_size():
+    """Rows are split into BATCH_SIZE-sized queries that all carry the project name."""
+    driver = FakeDriver()
+    count = 2 * example.BATCH_SIZE + 1
+    components = [_component(f'c{i}') for i in range(count)]
+
+    await example.populate_components(_graphiti(driver), 'AgentForge', components)
+
+    assert [len(params['rows']) for _, params in driver.calls] == [
+        example.BATCH_SIZE,
+        example.BATCH_SIZE,
+        1,
+    ]
+    assert all(params['project_name'] == 'AgentForge' for _, params in driver.calls)
+    assert [row['name'] for _, params in driver.calls for row in params['rows']] == [
+        f'c{i}' for i in range(count)
+    ]
+
+
+async def test_bulk_merge_deduplicates_by_name_last_wins():
+    """Repeated names collapse to a single row carrying the last entity's data."""
+    driver = FakeDriver()
+    components = [
+        example.Component(name='api', type=example.ComponentType.SERVICE, description='first'),
+        example.Component(name='api', type=example.ComponentType.SERVICE, description='second'),
+    ]
+
+    await example.populate_components(_graphiti(driver), 'AgentForge', components)
+
+    ((_, params),) = driver.calls
+    (row,) = params['rows']
+    assert row['name'] == 'api'
+    assert row['summary'] == 'second'
+    assert row['content_hash'] == example._content_hash(row['metadata'])
+
+
+async def test_missing_project_reports_zero_writes(capsys):
+    """When the project node is absent the query returns nothing and nothing is counted."""
+    driver = FakeDriver(project_exists=False)
+
+    await example.populate_features(
+        _graphiti(driver), 'Missing', example.AGENTFORGE_FEATURES, verbose=True
+    )
+
+    out = capsys.readouterr().out
+    assert '✅ Wrote 0 features' in out
+    assert 'Wrote feature:' not in out
+
+
+async def test_verbose_gates_per_entity_lines(capsys):
+    """Per-entity lines are only printed when verbose is set; the summary always is."""
+    features = example.AGENTFORGE_FEATURES
+
+    await example.populate_features(_graphiti(FakeDriver()), 'AgentForge', features)
+    quiet = capsys.readouterr().out
+    assert 'Wrote feature:' not in quiet
+    assert f'✅ Wrote {len(features)} features' in quiet
+
+    await example.populate_features(_graphiti(FakeDriver()), 'AgentForge', features, verbose=True)
+    loud = capsys.readouterr().out
+    for feature in features:
+        assert f'✅ Wrote feature: {feature.name}' in loud
+
+
+async def test_add_component_dependencies_deduplicates_internal_pairs(capsys):
+    """Only dependencies on known components are written, each pair once."""
+    driver = FakeDriver()
+    components = [
+        _component('api', ('db', 'db', 'redis')),
+        _component('api', ('db',)),
+        _component('db'),
+    ]
+
+    await example.add_component_dependencies(_graphiti(driver), components)
+
+    ((_, params),) = driver.calls
+    assert params['edges'] == [
+        {'source': 'api', 'target': 'db', 'fact': 'api depends on db'},
+    ]
+    assert '🔗 Added 1 component dependencies' in capsys.readouterr().out